@@ -0,0 +1,50 @@
+"""add collection versions
+
+Revision ID: 0b7e3d5a9c21
+Revises: e19b6f4c8d72
+Create Date: 2026-10-15 13:47:12.662094
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0b7e3d5a9c21'
+down_revision: Union[str, Sequence[str], None] = 'e19b6f4c8d72'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('collection_versions',
+    sa.Column('name', sa.String(length=50), nullable=False),
+    sa.Column('version', sa.BigInteger(), nullable=False),
+    sa.PrimaryKeyConstraint('name')
+    )
+    # Bumps the version named after the table that fired it, once per statement.
+    op.execute("""
+        CREATE FUNCTION bump_collection_version() RETURNS trigger
+        LANGUAGE plpgsql AS $$
+        BEGIN
+            INSERT INTO collection_versions (name, version) VALUES (TG_TABLE_NAME, 1)
+            ON CONFLICT (name) DO UPDATE SET version = collection_versions.version + 1;
+            RETURN NULL;
+        END
+        $$
+    """)
+    op.execute("""
+        CREATE TRIGGER activities_bump_collection_version
+        AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON activities
+        FOR EACH STATEMENT EXECUTE FUNCTION bump_collection_version()
+    """)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute('DROP TRIGGER activities_bump_collection_version ON activities')
+    op.execute('DROP FUNCTION bump_collection_version()')
+    op.drop_table('collection_versions')
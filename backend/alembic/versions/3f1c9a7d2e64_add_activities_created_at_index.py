@@ -0,0 +1,28 @@
+"""add activities created_at index
+
+Revision ID: 3f1c9a7d2e64
+Revises: 8b4af87b8e90
+Create Date: 2026-10-15 09:12:41.204518
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3f1c9a7d2e64'
+down_revision: Union[str, Sequence[str], None] = '8b4af87b8e90'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index('ix_activities_created_at', 'activities', ['created_at'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_activities_created_at', table_name='activities')
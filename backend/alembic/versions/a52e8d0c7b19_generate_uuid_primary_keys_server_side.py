@@ -0,0 +1,33 @@
+"""generate uuid primary keys server side
+
+Revision ID: a52e8d0c7b19
+Revises: 3f1c9a7d2e64
+Create Date: 2026-10-15 10:03:27.518862
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a52e8d0c7b19'
+down_revision: Union[str, Sequence[str], None] = '3f1c9a7d2e64'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+TABLES = ('users', 'activities', 'flows', 'flow_steps', 'sessions', 'session_step_logs')
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # gen_random_uuid() is built in from PostgreSQL 13; older servers need pgcrypto.
+    for table in TABLES:
+        op.alter_column(table, 'id', server_default=sa.text('gen_random_uuid()'))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for table in TABLES:
+        op.alter_column(table, 'id', server_default=None)
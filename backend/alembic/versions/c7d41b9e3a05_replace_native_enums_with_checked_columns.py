@@ -0,0 +1,63 @@
+"""replace native enums with checked columns
+
+Revision ID: c7d41b9e3a05
+Revises: a52e8d0c7b19
+Create Date: 2026-10-15 10:41:09.736214
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c7d41b9e3a05'
+down_revision: Union[str, Sequence[str], None] = 'a52e8d0c7b19'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+ACTIVITY_CATEGORIES = ('BREATHWORK', 'GROUNDING', 'JOURNALING', 'SENSORY_MINDFULNESS', 'MOVEMENT', 'NATURE', 'CONNECTION', 'COLD_EXPOSURE', 'MEDITATION')
+ACTIVITY_TIMES = {'FIVE_MINUTES': 5, 'TEN_MINUTES': 10, 'FIFTEEN_MINUTES': 15, 'TWENTY_MINUTES': 20, 'THIRTY_MINUTES': 30}
+SESSION_OUTCOMES = ('COMPLETED', 'ABANDONED', 'EXITED_EARLY')
+
+
+def _in_list(column: str, values) -> str:
+    return f"{column} IN ({', '.join(repr(value) for value in values)})"
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.alter_column('activities', 'category', type_=sa.String(length=32), postgresql_using='category::text')
+    op.create_check_constraint('ck_activities_category', 'activities', _in_list('category', ACTIVITY_CATEGORIES))
+
+    cases = ' '.join(f"WHEN '{name}' THEN {value}" for name, value in ACTIVITY_TIMES.items())
+    op.alter_column('activities', 'duration_minutes', type_=sa.Integer(), postgresql_using=f'CASE duration_minutes::text {cases} END')
+    op.create_check_constraint('ck_activities_duration_minutes', 'activities', _in_list('duration_minutes', ACTIVITY_TIMES.values()))
+
+    op.alter_column('sessions', 'outcome', type_=sa.String(length=32), postgresql_using='outcome::text')
+    op.create_check_constraint('ck_sessions_outcome', 'sessions', _in_list('outcome', SESSION_OUTCOMES))
+
+    op.execute('DROP TYPE activitycategory')
+    op.execute('DROP TYPE activitytime')
+    op.execute('DROP TYPE sessionoutcome')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    activity_category = postgresql.ENUM(*ACTIVITY_CATEGORIES, name='activitycategory')
+    activity_time = postgresql.ENUM(*ACTIVITY_TIMES, name='activitytime')
+    session_outcome = postgresql.ENUM(*SESSION_OUTCOMES, name='sessionoutcome')
+    for enum_type in (activity_category, activity_time, session_outcome):
+        enum_type.create(op.get_bind())
+
+    op.drop_constraint('ck_sessions_outcome', 'sessions', type_='check')
+    op.alter_column('sessions', 'outcome', type_=session_outcome, postgresql_using='outcome::sessionoutcome')
+
+    op.drop_constraint('ck_activities_duration_minutes', 'activities', type_='check')
+    cases = ' '.join(f"WHEN {value} THEN '{name}'" for name, value in ACTIVITY_TIMES.items())
+    op.alter_column('activities', 'duration_minutes', type_=activity_time, postgresql_using=f'(CASE duration_minutes {cases} END)::activitytime')
+
+    op.drop_constraint('ck_activities_category', 'activities', type_='check')
+    op.alter_column('activities', 'category', type_=activity_category, postgresql_using='category::activitycategory')
@@ -0,0 +1,38 @@
+"""index foreign keys
+
+Revision ID: e19b6f4c8d72
+Revises: c7d41b9e3a05
+Create Date: 2026-10-15 11:20:54.093117
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e19b6f4c8d72'
+down_revision: Union[str, Sequence[str], None] = 'c7d41b9e3a05'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index('ix_flow_steps_flow_order', 'flow_steps', ['flow_id', 'order'], unique=False)
+    op.create_index(op.f('ix_flow_steps_activity_id'), 'flow_steps', ['activity_id'], unique=False)
+    op.create_index(op.f('ix_sessions_user_id'), 'sessions', ['user_id'], unique=False)
+    op.create_index(op.f('ix_sessions_flow_id'), 'sessions', ['flow_id'], unique=False)
+    op.create_index(op.f('ix_session_step_logs_session_id'), 'session_step_logs', ['session_id'], unique=False)
+    op.create_index(op.f('ix_session_step_logs_flow_step_id'), 'session_step_logs', ['flow_step_id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_session_step_logs_flow_step_id'), table_name='session_step_logs')
+    op.drop_index(op.f('ix_session_step_logs_session_id'), table_name='session_step_logs')
+    op.drop_index(op.f('ix_sessions_flow_id'), table_name='sessions')
+    op.drop_index(op.f('ix_sessions_user_id'), table_name='sessions')
+    op.drop_index(op.f('ix_flow_steps_activity_id'), table_name='flow_steps')
+    op.drop_index('ix_flow_steps_flow_order', table_name='flow_steps')
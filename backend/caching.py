@@ -0,0 +1,37 @@
+from typing import Awaitable, Callable
+
+from fastapi_cache import FastAPICache
+from fastapi_cache.backends.inmemory import InMemoryBackend, Value
+
+from config import settings
+
+
+class BoundedInMemoryBackend(InMemoryBackend):
+    """In-memory cache backend that evicts the oldest entries past a fixed size."""
+
+    def __init__(self, max_entries: int) -> None:
+        self._store = {}
+        self.max_entries = max_entries
+
+    async def set(self, key: str, value: bytes, expire: int | None = None) -> None:
+        async with self._lock:
+            self._store.pop(key, None)
+            while len(self._store) >= self.max_entries:
+                del self._store[next(iter(self._store))]
+            self._store[key] = Value(value, self._now + (expire or 0))
+
+
+async def get_or_build(namespace: str, key: str, build: Callable[[], Awaitable[bytes]], expire: int) -> bytes:
+    """Return the cached body for key in namespace, building and storing it on a miss."""
+    backend = FastAPICache.get_backend()
+    cache_key = f"{FastAPICache.get_prefix()}:{namespace}:{key}"
+    body = await backend.get(cache_key)
+    if body is None:
+        body = await build()
+        await backend.set(cache_key, body, expire)
+    return body
+
+
+def init_cache() -> None:
+    """Initialise the process-wide response cache."""
+    FastAPICache.init(BoundedInMemoryBackend(settings.cache_max_entries), prefix="oasis-cache")
@@ -0,0 +1,102 @@
+from uuid import UUID
+
+from sqlalchemy import case, func, literal_column, null, select
+from sqlalchemy.dialects.postgresql import aggregate_order_by
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import joinedload, selectinload
+
+from models import CollectionVersion, Flow, FlowStep, Session, SessionOutcome, SessionStepLog, User
+
+
+async def get_collection_version(db: AsyncSession, name: str) -> int:
+    """Get the current version of a collection, 0 if it has never been written."""
+    version = await db.scalar(select(CollectionVersion.version).where(CollectionVersion.name == name))
+    return version or 0
+
+
+async def get_flow_with_steps(db: AsyncSession, flow_id: UUID) -> Flow | None:
+    """Get a flow with its ordered steps and each step's activity."""
+    stmt = (
+        select(Flow)
+        .where(Flow.id == flow_id)
+        .options(selectinload(Flow.steps).joinedload(FlowStep.activity))
+    )
+    result = await db.execute(stmt)
+    return result.scalar_one_or_none()
+
+
+async def get_session_detail(db: AsyncSession, session_id: UUID) -> Session | None:
+    """Get a session with its flow and the step logs recorded against it."""
+    stmt = (
+        select(Session)
+        .where(Session.id == session_id)
+        .options(
+            joinedload(Session.flow),
+            selectinload(Session.step_logs).joinedload(SessionStepLog.flow_step),
+        )
+    )
+    result = await db.execute(stmt)
+    return result.scalar_one_or_none()
+
+
+async def load_user_dashboard(db: AsyncSession, user_id: UUID) -> dict | None:
+    """Get a user's session history, with step logs nested inline, in one query.
+
+    Postgres assembles the whole document with jsonb_agg, so nothing is
+    hydrated through the ORM and no per-relationship loads are issued. The
+    engine decodes the jsonb result with orjson.
+    """
+    empty_array = literal_column("'[]'::jsonb")
+
+    flow_step = case(
+        (FlowStep.id.is_(None), null()),
+        else_=func.jsonb_build_object(
+            "id", FlowStep.id,
+            "order", FlowStep.order,
+            "activity_id", FlowStep.activity_id,
+            "has_check_in", FlowStep.has_check_in,
+        ),
+    )
+    step_log = func.jsonb_build_object(
+        "id", SessionStepLog.id,
+        "started_at", SessionStepLog.started_at,
+        "completed_at", SessionStepLog.completed_at,
+        "skipped", SessionStepLog.skipped,
+        "flow_step", flow_step,
+    )
+    step_logs = (
+        select(func.coalesce(func.jsonb_agg(aggregate_order_by(step_log, SessionStepLog.started_at)), empty_array))
+        .select_from(SessionStepLog)
+        .outerjoin(FlowStep, SessionStepLog.flow_step_id == FlowStep.id)
+        .where(SessionStepLog.session_id == Session.id)
+        .scalar_subquery()
+    )
+
+    # jsonb_build_object bypasses the Enum type, which stores member names.
+    outcome = case(
+        {outcome.name: outcome.value for outcome in SessionOutcome},
+        value=Session.outcome,
+    )
+    session = func.jsonb_build_object(
+        "id", Session.id,
+        "flow_id", Session.flow_id,
+        "started_at", Session.started_at,
+        "ended_at", Session.ended_at,
+        "outcome", outcome,
+        "step_logs", step_logs,
+    )
+    sessions = (
+        select(func.coalesce(func.jsonb_agg(aggregate_order_by(session, Session.started_at.desc())), empty_array))
+        .where(Session.user_id == User.id)
+        .scalar_subquery()
+    )
+
+    stmt = select(
+        func.jsonb_build_object(
+            "id", User.id,
+            "display_name", User.display_name,
+            "sessions", sessions,
+        )
+    ).where(User.id == user_id)
+    result = await db.execute(stmt)
+    return result.scalar_one_or_none()
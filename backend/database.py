@@ -1,13 +1,33 @@
+import asyncio
+import logging
 from typing import AsyncGenerator
 
+from fastapi import Request
+import orjson
+from sqlalchemy import event
 from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.orm import ORMExecuteState, Session, raiseload
+from sqlalchemy.pool import AsyncAdaptedQueuePool
 
 from config import settings
 
 
+logger = logging.getLogger(__name__)
+
 engine = create_async_engine(
     settings.database_url,
     echo=settings.debug,
+    poolclass=AsyncAdaptedQueuePool,
+    pool_size=settings.db_pool_size,
+    max_overflow=settings.db_max_overflow,
+    pool_pre_ping=settings.db_pool_pre_ping,
+    pool_recycle=settings.db_pool_recycle,
+    json_deserializer=orjson.loads,
+    connect_args={
+        "server_settings": {"jit": "on" if settings.db_jit else "off"},
+        "statement_cache_size": settings.db_statement_cache_size,
+        "prepared_statement_cache_size": settings.db_statement_cache_size,
+    },
 )
 
 async_session_maker = async_sessionmaker(
@@ -17,15 +37,46 @@ async_session_maker = async_sessionmaker(
 )
 
 
-async def get_db() -> AsyncGenerator[AsyncSession, None]:
-    """Dependency that provides a database session."""
+if settings.db_strict_loading:
+    @event.listens_for(Session, "do_orm_execute")
+    def _raise_on_unrequested_loads(orm_execute_state: ORMExecuteState) -> None:
+        """Fail any ORM select that reaches a relationship it didn't explicitly load."""
+        if orm_execute_state.is_select and not orm_execute_state.is_relationship_load:
+            orm_execute_state.statement = orm_execute_state.statement.options(raiseload("*"))
+
+
+async def warm_pool() -> None:
+    """Open pool_size connections up front so the first requests don't pay connect cost.
+
+    Best-effort: failed connects are logged and left for the pool to retry on
+    demand, so an unreachable database doesn't block startup.
+    """
+
+    async def checkout() -> None:
+        async with engine.connect():
+            pass
+
+    results = await asyncio.gather(
+        *(checkout() for _ in range(settings.db_pool_size)), return_exceptions=True
+    )
+    failures = [result for result in results if isinstance(result, Exception)]
+    if failures:
+        logger.warning(
+            "Pool warm-up opened %d of %d connections: %r",
+            len(results) - len(failures),
+            len(results),
+            failures[0],
+        )
+
+
+async def get_db(request: Request) -> AsyncGenerator[AsyncSession, None]:
+    """Dependency that provides one session and transaction for the whole request.
+
+    The transaction commits once the request is handled, or rolls back if it
+    raises. Handlers that must persist before responding can commit early.
+    """
 
     async with async_session_maker() as session:
-        try:
+        async with session.begin():
+            request.state.db = session
             yield session
-            await session.commit()
-        except Exception:
-            await session.rollback()
-            raise
-        finally:
-            await session.close()
\ No newline at end of file
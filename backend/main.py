@@ -1,18 +1,53 @@
-from fastapi import FastAPI, Depends, HTTPException
+import asyncio
+from contextlib import asynccontextmanager
+from functools import lru_cache
+from uuid import UUID
+
+from fastapi import FastAPI, Body, Depends, HTTPException, Query, Request
+from fastapi.responses import ORJSONResponse, Response, StreamingResponse
 from fastapi.middleware.cors import CORSMiddleware
-from sqlalchemy import select
+from fastapi_cache import FastAPICache
+import orjson
+from sqlalchemy import insert, select
 from sqlalchemy.ext.asyncio import AsyncSession
+import uvloop
 
+from caching import get_or_build, init_cache
 from config import settings
-from database import get_db
-from models import Activity
-from schemas import ActivityCreate, ActivityResponse
+from crud import get_collection_version, load_user_dashboard
+from database import async_session_maker, engine, get_db, warm_pool
+from models import Activity, new_uuid
+from schemas import ACTIVITY_LIST_ADAPTER, ActivityCreate, ActivityResponse
+
+
+asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+
+ACTIVITY_RESPONSE_COLUMNS = (
+    Activity.id,
+    Activity.name,
+    Activity.category,
+    Activity.duration_minutes,
+    Activity.instructions,
+)
+
+ACTIVITIES_BULK_MAX = 500
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Set up the response cache and warm the connection pool on startup; release the pool on shutdown."""
+    init_cache()
+    await warm_pool()
+    yield
+    await engine.dispose()
 
 
 app = FastAPI(
     title=settings.app_name,
     description="Mood-boosting toolkit to help users manage stress and improve mental well-being.",
     version="0.1.0",
+    lifespan=lifespan,
+    default_response_class=ORJSONResponse,
 )
 
 app.add_middleware(
@@ -29,9 +64,9 @@ async def health_check():
     return {"status": "ok"}
 
 
-@app.get("/")
-async def root():
-    """Root endpoint."""
+@lru_cache
+def root_payload() -> dict:
+    """Build the root endpoint body once; it only depends on static settings."""
     return {
         "name": settings.app_name,
         "version": "0.1.0",
@@ -39,32 +74,142 @@ async def root():
     }
 
 
+@app.get("/")
+async def root():
+    """Root endpoint."""
+    return root_payload()
+
+
 @app.post("/activities", response_model=ActivityResponse)
 async def create_activity(
     activity_data: ActivityCreate,
     db: AsyncSession = Depends(get_db),
 ):
     """Create a new activity."""
-    activity = Activity(
-        name=activity_data.name,
-        category=activity_data.category,
-        duration_minutes=activity_data.duration_minutes,
-        instructions=activity_data.instructions,
+    stmt = (
+        insert(Activity)
+        .values(**activity_data.model_dump())
+        .returning(*ACTIVITY_RESPONSE_COLUMNS)
     )
-    db.add(activity)
+    result = await db.execute(stmt)
+    activity = dict(result.mappings().one())
     await db.commit()
-    await db.refresh(activity)
+    await FastAPICache.clear(namespace="activities")
 
     return activity
 
 
-@app.get("/activities", response_model=list[ActivityResponse])
-async def get_activitiesdb (db: AsyncSession = Depends(get_db)):
-    """Get all activities."""
+@app.post("/activities/bulk", responses={200: {"model": list[ActivityResponse]}})
+async def create_activities_bulk(
+    activities_data: list[ActivityCreate] = Body(..., max_length=ACTIVITIES_BULK_MAX),
+    db: AsyncSession = Depends(get_db),
+) -> Response:
+    """Create several activities in batched round-trips, returned in request order.
+
+    Ids are generated client-side so the RETURNING rows, which come back in
+    no guaranteed order, can be matched to the request without forcing
+    SQLAlchemy to fall back to one INSERT per row.
+    """
+    if not activities_data:
+        return Response(content=b"[]", media_type="application/json")
+
+    values = [{"id": new_uuid(), **activity_data.model_dump()} for activity_data in activities_data]
+    result = await db.execute(insert(Activity).returning(*ACTIVITY_RESPONSE_COLUMNS), values)
+    rows = {row["id"]: row for row in result.mappings()}
+    activities = ACTIVITY_LIST_ADAPTER.validate_python([dict(rows[value["id"]]) for value in values])
+    await db.commit()
+    await FastAPICache.clear(namespace="activities")
+
+    return Response(content=ACTIVITY_LIST_ADAPTER.dump_json(activities), media_type="application/json")
+
+
+def etag_matches(if_none_match: str, etag: str) -> bool:
+    """Weakly compare an If-None-Match header against an ETag, as RFC 9110 requires."""
+    if if_none_match.strip() == "*":
+        return True
+    opaque_tag = etag.removeprefix("W/")
+    return any(tag.strip().removeprefix("W/") == opaque_tag for tag in if_none_match.split(","))
+
+
+@app.get("/activities", responses={200: {"model": list[ActivityResponse]}, 304: {"description": "Not Modified"}})
+async def get_activitiesdb(
+    request: Request,
+    limit: int = Query(50, ge=1, le=200),
+    offset: int = Query(0, ge=0),
+    db: AsyncSession = Depends(get_db),
+) -> Response:
+    """Get a page of activities, oldest first.
+
+    The weak ETag is the activities collection version, which a trigger bumps on
+    every insert, update, delete or truncate of the table, so clients
+    revalidating with If-None-Match get a bodiless 304 while nothing has
+    changed. Rendered pages are cached against the same ETag.
+    """
+
+    etag = f'W/"{await get_collection_version(db, "activities")}"'
+    if etag_matches(request.headers.get("if-none-match", ""), etag):
+        return Response(status_code=304, headers={"ETag": etag})
+
+    async def render_page() -> bytes:
+        stmt = (
+            select(*ACTIVITY_RESPONSE_COLUMNS)
+            .order_by(Activity.created_at, Activity.id)
+            .limit(limit)
+            .offset(offset)
+        )
+        result = await db.execute(stmt)
+        # asyncpg hands back its own uuid.UUID subclass, which orjson only
+        # serializes through the default hook.
+        return orjson.dumps([dict(row) for row in result.mappings()], default=str)
+
+    body = await get_or_build("activities", f"{etag}:{limit}:{offset}", render_page, expire=60)
+
+    return Response(content=body, media_type="application/json", headers={"ETag": etag})
+
+
+@app.get("/activities/export")
+async def export_activities():
+    """Stream every activity as a JSON array without loading them all into memory."""
+
+    async def rows():
+        async with async_session_maker() as session:
+            stmt = select(*ACTIVITY_RESPONSE_COLUMNS).order_by(Activity.created_at, Activity.id)
+            result = await session.stream(stmt)
+            yield b"["
+            first = True
+            async for row in result.mappings():
+                if not first:
+                    yield b","
+                first = False
+                yield orjson.dumps(dict(row), default=str)
+            yield b"]"
+
+    return StreamingResponse(rows(), media_type="application/json")
+
+
+async def get_current_user_id() -> UUID:
+    """Resolve the authenticated user's id.
+
+    Authentication isn't implemented yet, so this rejects every request until it is.
+    """
+    raise HTTPException(status_code=401, detail="Not authenticated")
+
+
+@app.get("/users/me/dashboard")
+async def get_user_dashboard(
+    user_id: UUID = Depends(get_current_user_id),
+    db: AsyncSession = Depends(get_db),
+) -> ORJSONResponse:
+    """Get the current user's session history with step logs nested inline."""
+
+    dashboard = await load_user_dashboard(db, user_id)
+    if dashboard is None:
+        raise HTTPException(status_code=404, detail="User not found")
 
-    result = await db.execute(select(Activity))
-    activities = result.scalars().all()
+    return ORJSONResponse(content=dashboard)
 
-    return activities
 
+if __name__ == "__main__":
+    import uvicorn
 
+    uvicorn.run("main:app", loop="uvloop", http="httptools", workers=settings.uvicorn_workers)
@@ -1,13 +1,35 @@
 import enum
+import os
+import threading
+from collections import deque
 from datetime import datetime
 from typing import List
-from uuid import uuid4
+import uuid
 
-from sqlalchemy import String, Text, Integer, Boolean, ForeignKey, Enum, func
+from sqlalchemy import String, Text, Integer, BigInteger, Boolean, ForeignKey, Enum, Index, CheckConstraint, func
 from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column, relationship
 from sqlalchemy.dialects.postgresql import UUID, TIMESTAMP
 
 
+_UUID_BATCH_SIZE = 256
+_uuid_batch: deque[uuid.UUID] = deque()
+_uuid_batch_lock = threading.Lock()
+
+
+def new_uuid() -> uuid.UUID:
+    """Generate a uuid4 client-side, for ids needed before the row is inserted.
+
+    UUIDs are carved from one os.urandom read per batch of 256. Primary keys
+    default to gen_random_uuid() on the server; use this only where the id must
+    be known up front, e.g. to match RETURNING rows back to a batch insert.
+    """
+    with _uuid_batch_lock:
+        if not _uuid_batch:
+            buffer = os.urandom(16 * _UUID_BATCH_SIZE)
+            _uuid_batch.extend(uuid.UUID(bytes=buffer[start:start + 16], version=4) for start in range(0, len(buffer), 16))
+        return _uuid_batch.popleft()
+
+
 class ActivityCategory(str, enum.Enum):
     """Categories for mood boosting activities"""
 
@@ -49,7 +71,7 @@ class User(Base):
     """A user of Oasis."""
     __tablename__ = "users"
 
-    id: Mapped[str] = mapped_column(UUID(as_uuid=False), primary_key=True, default=lambda:str(uuid4()))
+    id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True, server_default=func.gen_random_uuid())
     email: Mapped[str] = mapped_column(String(255), unique=True, nullable=False)
     hashed_password: Mapped[str] = mapped_column(String(255), nullable=False)
     display_name: Mapped[str] = mapped_column(String(100), nullable=False)
@@ -60,7 +82,7 @@ class User(Base):
     created_at: Mapped[datetime] = mapped_column(TIMESTAMP(timezone=True), server_default=func.now(), nullable=False)
     updated_at: Mapped[datetime] = mapped_column(TIMESTAMP(timezone=True), server_default=func.now(), onupdate=func.now(), nullable=False)
 
-    sessions: Mapped[List["Session"]] = relationship("Session", back_populates="user", lazy="selectin")
+    sessions: Mapped[List["Session"]] = relationship("Session", back_populates="user", lazy="raise_on_sql")
 
     def __repr__(self) -> str:
         return f"<User {self.display_name} ({self.email})>"
@@ -70,16 +92,26 @@ class Activity(Base):
     """A single mood-boosting activity."""
 
     __tablename__ = "activities"
-
-    id: Mapped[str] = mapped_column(UUID(as_uuid=False), primary_key=True, default=lambda:str(uuid4()))
+    __table_args__ = (
+        Index("ix_activities_created_at", "created_at"),
+        CheckConstraint(
+            f"duration_minutes IN ({', '.join(str(time.value) for time in ActivityTime)})",
+            name="ck_activities_duration_minutes",
+        ),
+    )
+
+    id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True, server_default=func.gen_random_uuid())
     name: Mapped[str] = mapped_column(String(100), nullable=False)
-    category: Mapped[ActivityCategory] = mapped_column(Enum(ActivityCategory), nullable=False)
-    duration_minutes: Mapped[ActivityTime] = mapped_column(Enum(ActivityTime), nullable=False)
+    category: Mapped[ActivityCategory] = mapped_column(
+        Enum(ActivityCategory, name="ck_activities_category", native_enum=False, length=32, validate_strings=True, create_constraint=True),
+        nullable=False,
+    )
+    duration_minutes: Mapped[int] = mapped_column(Integer, nullable=False)
     instructions: Mapped[str] = mapped_column(Text, nullable=False)
 
     created_at: Mapped[datetime] = mapped_column(TIMESTAMP(timezone=True), server_default=func.now(), nullable=False)
 
-    flow_steps: Mapped[List["FlowStep"]] = relationship("FlowStep", back_populates="activity", lazy="selectin")
+    flow_steps: Mapped[List["FlowStep"]] = relationship("FlowStep", back_populates="activity", lazy="raise_on_sql")
 
     def __repr__(self) -> str:
         return f"<Activity {self.name} ({self.category.value})>"
@@ -93,14 +125,14 @@ class Flow(Base):
 
     __tablename__ = "flows"
 
-    id: Mapped[str] = mapped_column(UUID(as_uuid=False), primary_key=True, default=lambda:str(uuid4()))
+    id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True, server_default=func.gen_random_uuid())
     name: Mapped[str] = mapped_column(String(100), nullable=False)
     description: Mapped[str] = mapped_column(Text, nullable=False)
 
     created_at: Mapped[datetime] = mapped_column(TIMESTAMP(timezone=True), server_default=func.now(), nullable=False)
 
-    steps: Mapped[List["FlowStep"]] = relationship("FlowStep", back_populates="flow", lazy="selectin", order_by="FlowStep.order")
-    sessions: Mapped[List["Session"]] = relationship("Session", back_populates="flow", lazy="selectin")
+    steps: Mapped[List["FlowStep"]] = relationship("FlowStep", back_populates="flow", lazy="raise_on_sql", order_by="FlowStep.order")
+    sessions: Mapped[List["Session"]] = relationship("Session", back_populates="flow", lazy="raise_on_sql")
 
     def __repr__(self) -> str:
         return f"<Flow {self.name}>"
@@ -110,17 +142,18 @@ class FlowStep(Base):
     """A single step within a flow, linking to an activity and check-in behavior."""
 
     __tablename__ = "flow_steps"
+    __table_args__ = (Index("ix_flow_steps_flow_order", "flow_id", "order"),)
 
-    id: Mapped[str] = mapped_column(UUID(as_uuid=False), primary_key=True, default=lambda:str(uuid4()))
-    flow_id: Mapped[str] = mapped_column(UUID(as_uuid=False), ForeignKey("flows.id", ondelete="CASCADE"), nullable=False)
-    activity_id: Mapped[str] = mapped_column(UUID(as_uuid=False), ForeignKey("activities.id", ondelete="CASCADE"), nullable=False)
+    id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True, server_default=func.gen_random_uuid())
+    flow_id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), ForeignKey("flows.id", ondelete="CASCADE"), nullable=False)
+    activity_id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), ForeignKey("activities.id", ondelete="CASCADE"), nullable=False, index=True)
     order: Mapped[int] = mapped_column(Integer, nullable=False)
     
     has_check_in: Mapped[bool] = mapped_column(Boolean, default=False, nullable=False)
 
-    flow: Mapped["Flow"] = relationship("Flow", back_populates="steps")
-    activity: Mapped["Activity"] = relationship("Activity", back_populates="flow_steps")
-    step_logs: Mapped[List["SessionStepLog"]] = relationship("SessionStepLog", back_populates="flow_step", lazy="selectin")
+    flow: Mapped["Flow"] = relationship("Flow", back_populates="steps", lazy="raise_on_sql")
+    activity: Mapped["Activity"] = relationship("Activity", back_populates="flow_steps", lazy="raise_on_sql")
+    step_logs: Mapped[List["SessionStepLog"]] = relationship("SessionStepLog", back_populates="flow_step", lazy="raise_on_sql")
 
     def __repr__(self) -> str:
         return f"<FlowStep flow={self.flow_id} order={self.order}>"
@@ -134,18 +167,21 @@ class Session(Base):
     """
     __tablename__ = "sessions"
 
-    id: Mapped[str] = mapped_column(UUID(as_uuid=False), primary_key=True, default=lambda: str(uuid4()))
+    id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True, server_default=func.gen_random_uuid())
     
-    user_id: Mapped[str] = mapped_column(UUID(as_uuid=False), ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
-    flow_id: Mapped[str] = mapped_column(UUID(as_uuid=False), ForeignKey("flows.id", ondelete="SET NULL"), nullable=True)
+    user_id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), ForeignKey("users.id", ondelete="CASCADE"), nullable=False, index=True)
+    flow_id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), ForeignKey("flows.id", ondelete="SET NULL"), nullable=True, index=True)
     
     started_at: Mapped[datetime] = mapped_column(TIMESTAMP(timezone=True), server_default=func.now(), nullable=False)
     ended_at: Mapped[datetime | None] = mapped_column(TIMESTAMP(timezone=True), nullable=True)
-    outcome: Mapped[SessionOutcome | None] = mapped_column(Enum(SessionOutcome), nullable=True)
+    outcome: Mapped[SessionOutcome | None] = mapped_column(
+        Enum(SessionOutcome, name="ck_sessions_outcome", native_enum=False, length=32, validate_strings=True, create_constraint=True),
+        nullable=True,
+    )
 
-    user: Mapped["User"] = relationship("User", back_populates="sessions")
-    flow: Mapped["Flow | None"] = relationship("Flow", back_populates="sessions")
-    step_logs: Mapped[List["SessionStepLog"]] = relationship("SessionStepLog", back_populates="session", lazy="selectin")
+    user: Mapped["User"] = relationship("User", back_populates="sessions", lazy="raise_on_sql")
+    flow: Mapped["Flow | None"] = relationship("Flow", back_populates="sessions", lazy="raise_on_sql")
+    step_logs: Mapped[List["SessionStepLog"]] = relationship("SessionStepLog", back_populates="session", lazy="raise_on_sql")
 
     def __repr__(self) -> str:
         return f"<Session user={self.user_id} outcome={self.outcome}>"
@@ -156,17 +192,33 @@ class SessionStepLog(Base):
 
     __tablename__ = "session_step_logs"
 
-    id: Mapped[str] = mapped_column(UUID(as_uuid=False), primary_key=True, default=lambda: str(uuid4()))
-    session_id: Mapped[str] = mapped_column(UUID(as_uuid=False), ForeignKey("sessions.id", ondelete="CASCADE"), nullable=False)
-    flow_step_id: Mapped[str] = mapped_column(UUID(as_uuid=False), ForeignKey("flow_steps.id", ondelete="SET NULL"), nullable=True)
+    id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True, server_default=func.gen_random_uuid())
+    session_id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), ForeignKey("sessions.id", ondelete="CASCADE"), nullable=False, index=True)
+    flow_step_id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), ForeignKey("flow_steps.id", ondelete="SET NULL"), nullable=True, index=True)
 
     started_at: Mapped[datetime] = mapped_column(TIMESTAMP(timezone=True), server_default=func.now(), nullable=False)
     completed_at: Mapped[datetime | None] = mapped_column(TIMESTAMP(timezone=True), nullable=True)
     skipped: Mapped[bool] = mapped_column(Boolean, default=False)
 
-    session: Mapped["Session"] = relationship("Session", back_populates="step_logs")
-    flow_step: Mapped["FlowStep | None"] = relationship("FlowStep", back_populates="step_logs")
+    session: Mapped["Session"] = relationship("Session", back_populates="step_logs", lazy="raise_on_sql")
+    flow_step: Mapped["FlowStep | None"] = relationship("FlowStep", back_populates="step_logs", lazy="raise_on_sql")
 
     def __repr__(self) -> str:
         status = "skipped" if self.skipped else "completed" if self.completed_at else "in_progress"
         return f"<SessionStepLog session={self.session_id} status={status}>"
+
+
+class CollectionVersion(Base):
+    """A counter bumped by every write to a collection, used to version cached reads of it.
+
+    The bump is done by a statement-level trigger on the collection's table
+    (see the collection_versions migration), so writes from any source count.
+    """
+
+    __tablename__ = "collection_versions"
+
+    name: Mapped[str] = mapped_column(String(50), primary_key=True)
+    version: Mapped[int] = mapped_column(BigInteger, nullable=False)
+
+    def __repr__(self) -> str:
+        return f"<CollectionVersion {self.name}={self.version}>"
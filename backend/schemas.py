@@ -1,4 +1,6 @@
-from pydantic import BaseModel
+from uuid import UUID
+
+from pydantic import BaseModel, TypeAdapter
 
 from models import ActivityCategory, ActivityTime
 
@@ -15,11 +17,13 @@ class ActivityCreate(BaseModel):
 class ActivityResponse(BaseModel):
     """Response body for an activity."""
 
-    id: str
+    id: UUID
     name: str
     category: ActivityCategory
     duration_minutes: ActivityTime
     instructions: str
 
-    model_config = {"from_attributes": True}
-    
\ No newline at end of file
+    model_config = {"from_attributes": True, "defer_build": True}
+
+
+ACTIVITY_LIST_ADAPTER = TypeAdapter(list[ActivityResponse])